@@ -1,13 +1,53 @@
 import hashlib
 import argparse
 import logging
+import mmap
 import time
 import os
+import queue
 import shutil
 import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-import re
+
+# Faster non-cryptographic hashes for change detection, when installed
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Shared worker pool for hashing and copying files; hashlib releases the GIL
+# while hashing large buffers, so threads scale for both I/O and CPU work
+executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
+# Hash constructors by name, with the optional backends only when installed
+HASH_ALGORITHMS = {"md5": hashlib.md5}
+if blake3 is not None:
+    HASH_ALGORITHMS["blake3"] = blake3.blake3
+if xxhash is not None:
+    HASH_ALGORITHMS["xxh3"] = xxhash.xxh3_64
+HASH_PACKAGES = {"blake3": "blake3", "xxh3": "xxhash"}
+
+# Hash used for change detection, selected with --hash
+hash_algorithm = "md5"
+
+# File-to-file sendfile and copy_file_range are only usable on Linux; other
+# platforms either lack them or require a socket as the sendfile output
+KERNEL_COPY = sys.platform.startswith("linux")
+
+# Files below this size are hashed from a single read
+SMALL_FILE_SIZE = 64 * 1024
+
+# Hashes of source and destination files keyed by path, stored with the size and
+# modification time they were computed for: {path: (size, mtime_ns, digest)}
+_hash_cache = {}
 
 
 def remove_readonly(func, path, _):
@@ -31,20 +71,22 @@ def convert_interval(interval, unit):
 
 class SyncEventHandler(FileSystemEventHandler):
     """Event handler for file system changes."""
-    def __init__(self, source_logger):
+    def __init__(self, source_logger, event_queue):
         self.source_logger = source_logger
+        self.event_queue = event_queue
 
     def log_event(self, event):
-        """Log the file system event to the source log file and terminal."""
-        # Log the rename of the file or directory
+        """Queue the file system event for synchronization and log it to the source log file."""
+        # The rename of a file or directory is queued as the removal of the
+        # old path followed by the new path, the same way it is logged
         if event.event_type == "moved":
-            log_message_deleted = f"Event type: deleted: {event.src_path}"
-            log_message_moved = f"Event type: {event.event_type}: {event.dest_path}"
-            self.source_logger.info(log_message_deleted)
-            self.source_logger.info(log_message_moved)
+            self.event_queue.put(("deleted", event.src_path))
+            self.event_queue.put((event.event_type, event.dest_path))
+            self.source_logger.info("Event type: deleted: %s", event.src_path)
+            self.source_logger.info("Event type: %s: %s", event.event_type, event.dest_path)
         else:
-            log_message = f"Event type: {event.event_type}: {event.src_path}"
-            self.source_logger.info(log_message)
+            self.event_queue.put((event.event_type, event.src_path))
+            self.source_logger.info("Event type: %s: %s", event.event_type, event.src_path)
 
     def on_moved(self, event):
         """Handle moved file system event."""
@@ -63,57 +105,283 @@ class SyncEventHandler(FileSystemEventHandler):
         self.log_event(event)
 
 
-def calculate_md5(file_path, main_logger):
-    """Calculate the MD5 hash of a file."""
-    hash_md5 = hashlib.md5()
+def set_hash_algorithm(name):
+    """Select the hash used for change detection."""
+    global hash_algorithm
+    if name not in HASH_ALGORITHMS:
+        raise ValueError(f"Hash '{name}' requires the '{HASH_PACKAGES[name]}' package.")
+    hash_algorithm = name
+    _hash_cache.clear()
+
+
+def calculate_hash(file_path, main_logger):
+    """Calculate the hash of a file with the selected algorithm."""
+    hash_constructor = HASH_ALGORITHMS[hash_algorithm]
     try:
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            # Small files are read and hashed in a single call, skipping the
+            # buffer setup of file_digest and mmap that dominates their cost
+            if os.fstat(f.fileno()).st_size < SMALL_FILE_SIZE:
+                return hash_constructor(f.read()).hexdigest()
+
+            # Python 3.11+ feeds the file to the hasher in C
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, hash_constructor).hexdigest()
+
+            # Older versions hash the whole file in one call through mmap
+            file_hash = hash_constructor()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                file_hash.update(mm)
+            return file_hash.hexdigest()
+    except Exception as e:
+        main_logger.error("Error calculating hash for %s: %s", file_path, e)
+        return None
+
+
+def lookup_cached_hash(file_path, file_stat=None):
+    """Return the cached hash of a file if it is still valid, else None."""
+    cached = _hash_cache.get(file_path)
+    if cached is None:
+        return None
+    if file_stat is None:
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+    if cached[:2] != (file_stat.st_size, file_stat.st_mtime_ns):
+        return None
+    return cached[2]
+
+
+def cached_hash(file_path, main_logger):
+    """Return the hash of a file, reusing the cached value if it is unchanged."""
+    try:
+        file_stat = os.stat(file_path)
     except Exception as e:
-        main_logger.error(f"Error calculating MD5 for {file_path}: {e}")
+        main_logger.error("Error calculating hash for %s: %s", file_path, e)
         return None
 
+    digest = lookup_cached_hash(file_path, file_stat)
+    if digest is not None:
+        return digest
+
+    digest = calculate_hash(file_path, main_logger)
+    if digest is not None:
+        _hash_cache[file_path] = (file_stat.st_size, file_stat.st_mtime_ns, digest)
+    return digest
+
+
+def invalidate_hash_cache(path, directory=False):
+    """Drop the cached hash of a path, and of everything below it for a directory."""
+    _hash_cache.pop(path, None)
+    if not directory:
+        return
+    prefix = os.path.join(path, "")
+    for cached_path in [p for p in list(_hash_cache) if p.startswith(prefix)]:
+        _hash_cache.pop(cached_path, None)
+
+
+def files_differ(file_path_a, file_path_b, main_logger, file_hash=None):
+    """Compare two files block by block, stopping at the first difference.
+
+    If file_hash is given, the equal blocks are fed to it as they are read,
+    so when the files match it holds the digest of both.
+    """
+    chunk_size = 1024 * 1024
+    try:
+        with open(file_path_a, "rb") as fa, open(file_path_b, "rb") as fb:
+            while True:
+                chunk_a = fa.read(chunk_size)
+                if chunk_a != fb.read(chunk_size):
+                    return True
+                if not chunk_a:
+                    return False
+                if file_hash is not None:
+                    file_hash.update(chunk_a)
+    except Exception as e:
+        main_logger.error("Error comparing %s and %s: %s", file_path_a, file_path_b, e)
+        return True
+
+
+def hashes_differ(src_item_path, dest_item_path, main_logger):
+    """Compare a source file with its destination, using cached hashes when known."""
+    dest_hash = lookup_cached_hash(dest_item_path)
+    if dest_hash is not None:
+        return cached_hash(src_item_path, main_logger) != dest_hash
+
+    # Otherwise compare in lockstep, which stops at the first differing
+    # block, and cache the digest of both files when they turn out equal
+    try:
+        src_stat = os.stat(src_item_path)
+        dest_stat = os.stat(dest_item_path)
+    except Exception as e:
+        main_logger.error("Error comparing %s and %s: %s", src_item_path, dest_item_path, e)
+        return True
+    file_hash = HASH_ALGORITHMS[hash_algorithm]()
+    if files_differ(src_item_path, dest_item_path, main_logger, file_hash):
+        return True
+
+    digest = file_hash.hexdigest()
+    _hash_cache[src_item_path] = (src_stat.st_size, src_stat.st_mtime_ns, digest)
+    _hash_cache[dest_item_path] = (dest_stat.st_size, dest_stat.st_mtime_ns, digest)
+    return False
+
+
+def compare_metadata(src_stat, dest_stat):
+    """Decide from size and mtime whether a file changed, or None if unsure."""
+    # Matching size and modification time means the file is unchanged,
+    # so the contents only need to be compared when the metadata differs
+    if src_stat.st_size != dest_stat.st_size:
+        return True
+    if src_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return False
+    return None
+
+
+def needs_copy(src_item_path, dest_item_path, main_logger, src_stat=None, dest_stat=None,
+               compare=files_differ):
+    """Check if the destination file is missing or differs from the source."""
+    if dest_stat is None:
+        try:
+            dest_stat = os.stat(dest_item_path)
+        except FileNotFoundError:
+            return True
+    if src_stat is None:
+        src_stat = os.stat(src_item_path)
+
+    changed = compare_metadata(src_stat, dest_stat)
+    if changed is None:
+        changed = compare(src_item_path, dest_item_path, main_logger)
+        if not changed:
+            align_metadata(src_item_path, dest_item_path, src_stat, main_logger)
+    return changed
+
+
+def align_metadata(src_item_path, dest_item_path, src_stat, main_logger):
+    """Copy metadata onto an identical destination so later checks are stat-only."""
+    try:
+        shutil.copystat(src_item_path, dest_item_path)
+    except Exception as e:
+        main_logger.error("Error copying metadata from %s to %s: %s", src_item_path, dest_item_path, e)
+        return
+
+    # The destination's cached hash was keyed by its old modification time
+    digest = lookup_cached_hash(src_item_path, src_stat)
+    if digest is not None:
+        _hash_cache[dest_item_path] = (src_stat.st_size, src_stat.st_mtime_ns, digest)
+
+
+def copy_file_data(src_fd, dest_fd):
+    """Copy the remaining bytes between file descriptors inside the kernel (Linux only)."""
+    chunk_size = 8 * 1024 * 1024
+
+    # copy_file_range can reflink on copy-on-write filesystems; it is missing
+    # on older kernels and across some filesystem boundaries
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dest_fd, chunk_size):
+                pass
+            return
+        except OSError:
+            pass
+
+    # sendfile avoids copying the data through userspace buffers
+    while os.sendfile(dest_fd, src_fd, None, chunk_size):
+        pass
+
+
+def fast_copy(src_item_path, dest_item_path, src_stat=None):
+    """Copy a file and its metadata, using in-kernel copies where available."""
+    if src_stat is None:
+        src_stat = os.stat(src_item_path)
+
+    # Opening a named pipe or device would block, so anything but a regular
+    # file goes through shutil.copy2, which rejects special files
+    if not KERNEL_COPY or not stat.S_ISREG(src_stat.st_mode):
+        shutil.copy2(src_item_path, dest_item_path)
+        return
+
+    with open(src_item_path, "rb") as fsrc, open(dest_item_path, "wb") as fdst:
+        try:
+            copy_file_data(fsrc.fileno(), fdst.fileno())
+        except OSError:
+            # Fall back to a userspace copy from wherever the kernel copy stopped
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src_item_path, dest_item_path)
+
+
+def copy_if_changed(entry, dest_item_path, dest_entry, main_logger):
+    """Copy a single file to the destination if it is new or modified."""
+    src_item_path = entry.path
+    try:
+        if dest_entry is None or needs_copy(src_item_path, dest_item_path, main_logger,
+                                            entry.stat(), dest_entry.stat()):
+            fast_copy(src_item_path, dest_item_path, entry.stat())
+            main_logger.info("Copied: %s to %s", src_item_path, dest_item_path)
+    except Exception as e:
+        main_logger.error("Error copying %s to %s: %s", src_item_path, dest_item_path, e)
+
 
 def sync_folders(src, dest, log_file, main_logger):
     """Synchronize files and directories from source to destination."""
-    if not os.path.exists(dest):
-        os.makedirs(dest)
+    futures = []
+
+    # Walk the tree with an explicit stack of (source, destination) directories
+    pending_dirs = [(src, dest)]
+    while pending_dirs:
+        src_dir, dest_dir = pending_dirs.pop()
+        pending_dirs.extend(sync_directory(src_dir, dest_dir, main_logger, futures))
+
+    # Wait for all file copies submitted while walking the tree
+    for future in as_completed(futures):
+        future.result()
+
 
-    sourceFiles = set(os.listdir(src))
-    replicaFiles = set(os.listdir(dest))
+def sync_directory(src, dest, main_logger, futures):
+    """Synchronize a single directory level and return its subdirectories to visit.
+
+    File copies are submitted to the worker pool and appended to futures.
+    """
+    # A single scandir pass per side gives cached file types and stats
+    with os.scandir(src) as it:
+        sourceEntries = {entry.name: entry for entry in it}
+
+    # Only a missing destination needs creating, and it starts out empty
+    try:
+        with os.scandir(dest) as it:
+            replicaEntries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        os.makedirs(dest, exist_ok=True)
+        replicaEntries = {}
 
     # Copy new and modified files from src to dest
-    for item in sourceFiles:
-        src_item_path = os.path.join(src, item)
+    subdirs = []
+    for item, entry in sourceEntries.items():
         dest_item_path = os.path.join(dest, item)
 
-        if os.path.isdir(src_item_path):
-            sync_folders(src_item_path, dest_item_path, log_file, main_logger)
+        if entry.is_dir():
+            subdirs.append((entry.path, dest_item_path))
         else:
-            if not os.path.exists(dest_item_path) or calculate_md5(src_item_path, main_logger) != calculate_md5(dest_item_path, main_logger):
-                try:
-                    shutil.copy2(src_item_path, dest_item_path)
-                    main_logger.info(f"Copied: {src_item_path} to {dest_item_path}")
-                    print(f"Copied: {src_item_path} to {dest_item_path}")
-                except Exception as e:
-                    main_logger.error(f"Error copying {src_item_path} to {dest_item_path}: {e}")
+            futures.append(executor.submit(copy_if_changed, entry, dest_item_path,
+                                           replicaEntries.get(item), main_logger))
 
     # Remove files from dest that are not in src
-    for item in replicaFiles - sourceFiles:
-        dest_item_path = os.path.join(dest, item)
+    for item in replicaEntries.keys() - sourceEntries.keys():
+        dest_entry = replicaEntries[item]
+        dest_item_path = dest_entry.path
         try:
-            if os.path.isdir(dest_item_path):
+            if dest_entry.is_dir(follow_symlinks=False):
+                invalidate_hash_cache(dest_item_path, directory=True)
                 shutil.rmtree(dest_item_path, onerror=remove_readonly)
-                main_logger.info(f"Removed directory: {dest_item_path}")
-                print(f"Removed directory: {dest_item_path}")
+                main_logger.info("Removed directory: %s", dest_item_path)
             else:
+                invalidate_hash_cache(dest_item_path)
                 os.remove(dest_item_path)
-                main_logger.info(f"Removed file: {dest_item_path}")
-                print(f"Removed file: {dest_item_path}")
+                main_logger.info("Removed file: %s", dest_item_path)
         except Exception as e:
-            main_logger.error(f"Error removing {dest_item_path}: {e}")
+            main_logger.error("Error removing %s: %s", dest_item_path, e)
+
+    return subdirs
 
 
 def parse_event_log(log_file, main_logger):
@@ -121,61 +389,163 @@ def parse_event_log(log_file, main_logger):
     events = []
     try:
         with open(log_file, "r") as f:
-            lines = f.readlines()
-            for line in lines:
-                match = re.search(r'Event type: (.+?): (.+)', line)
-                if match:
-                    event_type = match.group(1)
-                    item_path = match.group(2)
+            for line in f:
+                # Lines look like "<asctime> - Event type: <event_type>: <path>"
+                _, found, message = line.partition("Event type: ")
+                if not found:
+                    continue
+                event_type, _, item_path = message.partition(": ")
+                item_path = item_path.rstrip("\n")
+                if item_path:
                     events.append((event_type, item_path))
     except Exception as e:
-        main_logger.error(f"Error reading log file {log_file}: {e}")
+        main_logger.error("Error reading log file %s: %s", log_file, e)
     return events
 
 
-def handle_event(event, src, dest, main_logger):
-    """Handle a single event by performing the corresponding file operation."""
+def stat_or_none(path, follow_symlinks=True):
+    """Return the stat result of a path, or None if it does not exist."""
+    try:
+        return os.stat(path, follow_symlinks=follow_symlinks)
+    except FileNotFoundError:
+        return None
+
+
+def handle_event(event, src, dest, main_logger, src_stat=None):
+    """Handle a single event by performing the corresponding file operation.
+
+    src_stat may carry a stat result of the source that the caller already has.
+    """
     event_type, src_item_path = event
     dest_item_path = os.path.join(dest, os.path.relpath(src_item_path, src))
 
     try:
         if event_type == "deleted":
-            if os.path.isdir(dest_item_path):
-                if os.path.exists(dest_item_path):
-                    shutil.rmtree(dest_item_path, onerror=remove_readonly)
-                    main_logger.info(f"Removed directory: {dest_item_path}")
-                    print(f"Removed directory: {dest_item_path}")
-            else:
-                if os.path.exists(dest_item_path):
-                    os.remove(dest_item_path)
-                    main_logger.info(f"Removed file: {dest_item_path}")
-                    print(f"Removed file: {dest_item_path}")
+            # Do not follow symlinks so that a link is removed, not its target
+            dest_stat = stat_or_none(dest_item_path, follow_symlinks=False)
+            if dest_stat is not None and stat.S_ISDIR(dest_stat.st_mode):
+                invalidate_hash_cache(dest_item_path, directory=True)
+                shutil.rmtree(dest_item_path, onerror=remove_readonly)
+                main_logger.info("Removed directory: %s", dest_item_path)
+            elif dest_stat is not None:
+                invalidate_hash_cache(dest_item_path)
+                os.remove(dest_item_path)
+                main_logger.info("Removed file: %s", dest_item_path)
         elif event_type in ["created", "modified", "moved"]:
-            if os.path.isdir(src_item_path):
-                if os.path.exists(src_item_path):
-                    if not os.path.exists(dest_item_path):
-                        shutil.copytree(src_item_path, dest_item_path)
-                        main_logger.info(f"Copied directory: {src_item_path} to {dest_item_path}")
-                        print(f"Copied directory: {src_item_path} to {dest_item_path}")
-            else:
-                if os.path.exists(src_item_path):
-                    if not os.path.exists(dest_item_path) or calculate_md5(src_item_path, main_logger) != calculate_md5(dest_item_path, main_logger):
-                        shutil.copy2(src_item_path, dest_item_path)
-                        main_logger.info(f"Copied file: {src_item_path} to {dest_item_path}")
-                        print(f"Copied file: {src_item_path} to {dest_item_path}")
+            if src_stat is None:
+                src_stat = stat_or_none(src_item_path)
+            dest_stat = stat_or_none(dest_item_path)
+            if event_type == "moved":
+                invalidate_hash_cache(dest_item_path, directory=dest_stat is not None
+                                      and stat.S_ISDIR(dest_stat.st_mode))
+            if src_stat is not None and stat.S_ISDIR(src_stat.st_mode):
+                if dest_stat is None:
+                    shutil.copytree(src_item_path, dest_item_path)
+                    main_logger.info("Copied directory: %s to %s", src_item_path, dest_item_path)
+            elif src_stat is not None:
+                if dest_stat is None or needs_copy(src_item_path, dest_item_path, main_logger,
+                                                   src_stat, dest_stat, compare=hashes_differ):
+                    fast_copy(src_item_path, dest_item_path, src_stat)
+                    main_logger.info("Copied file: %s to %s", src_item_path, dest_item_path)
     except Exception as e:
-        main_logger.error(f"Error handling event {event}: {e}")
-
-
-def sync_from_log(src, dest, source_log_file, main_logger):
-    """Synchronize files and directories based on the event log."""
-    events = parse_event_log(source_log_file, main_logger)
-    for event in events:
-        handle_event(event, src, dest, main_logger)
+        main_logger.error("Error handling event %s: %s", event, e)
+
+
+def coalesce_events(event_types, item_paths):
+    """Collapse redundant events into as few events per path as possible.
+
+    Every event is replayed against the current state of the source, so
+    apart from removals only the last event of a path matters: repeated
+    modifications become a single one, and a deletion or move supersedes
+    what came before it. A path that was created and deleted again within
+    the batch never reaches the replica, so it is dropped altogether.
+
+    A path that existed before the batch and was deleted before being
+    created or moved onto again keeps its deletion ahead of the final
+    event, so that the old replica entry, possibly of a different type,
+    is removed first. Paths keep the position of their first event so that
+    directories stay ahead of their contents.
+    """
+    # {path: (first event type, whether the old entry was deleted, last event type)}
+    coalesced = {}
+    for event_type, item_path in zip(event_types, item_paths):
+        first, deleted, _ = coalesced.get(item_path, (event_type, False, None))
+        if event_type == "deleted" and first == "created" and not deleted:
+            del coalesced[item_path]
+        else:
+            coalesced[item_path] = (first, deleted or event_type == "deleted", event_type)
+
+    coalesced_types = []
+    coalesced_paths = []
+    for item_path, (_, deleted, last) in coalesced.items():
+        if deleted and last != "deleted":
+            coalesced_types.append("deleted")
+            coalesced_paths.append(item_path)
+        coalesced_types.append(last)
+        coalesced_paths.append(item_path)
+    return coalesced_types, coalesced_paths
+
+
+def handle_events_batch(event_types, item_paths, src, dest, main_logger):
+    """Handle a batch of events given as parallel lists of types and paths."""
+    # File creations and modifications between other events do not depend
+    # on each other, so they run as a batch on the worker pool. Every other
+    # event waits for the batch so that ordering is preserved, and so that
+    # moves and deletions invalidate the hash cache while no task uses it
+    pending = []
+    for event in zip(event_types, item_paths):
+        event_type, item_path = event
+        # The source is stat'ed once here and handed down to handle_event
+        src_stat = stat_or_none(item_path) if event_type != "deleted" else None
+        if (event_type in ["created", "modified"] and src_stat is not None
+                and stat.S_ISREG(src_stat.st_mode)):
+            pending.append(executor.submit(handle_event, event, src, dest, main_logger, src_stat))
+        else:
+            wait(pending)
+            pending.clear()
+            handle_event(event, src, dest, main_logger, src_stat)
+    wait(pending)
+
+
+def sync_from_log(src, dest, event_types, item_paths, main_logger):
+    """Synchronize files and directories based on the collected events."""
+    event_types, item_paths = coalesce_events(event_types, item_paths)
+    handle_events_batch(event_types, item_paths, src, dest, main_logger)
+
+
+def create_observer():
+    """Create the file system observer, pinning the inotify backend on Linux."""
+    # Observer() falls back to polling when the inotify module cannot be imported
+    # on an unsupported libc; importing it directly raises UnsupportedLibcError instead
+    if sys.platform.startswith("linux"):
+        from watchdog.observers.inotify import InotifyObserver
+        return InotifyObserver()
+    return Observer()
+
+
+def take_event_batch(event_queue, event_types, item_paths, handler):
+    """Move all queued events into the batch and clear the source log file."""
+    # SyncEventHandler queues an event before logging it, so draining the
+    # queue while holding the handler lock guarantees that every line that
+    # is truncated belongs to an event in the batch. Events logged while the
+    # batch is synchronized stay in the file until their own batch is taken.
+    # The stream's own seek and truncate keep its buffered position
+    # consistent with the file.
+    handler.acquire()
+    try:
+        while True:
+            try:
+                event_type, item_path = event_queue.get_nowait()
+            except queue.Empty:
+                break
+            event_types.append(event_type)
+            item_paths.append(item_path)
 
-    # Clear the source log file after synchronization
-    with open('sourceLog.log', "w") as f:
-        f.truncate()
+        handler.flush()
+        handler.stream.seek(0)
+        handler.stream.truncate()
+    finally:
+        handler.release()
 
 
 def main():
@@ -186,11 +556,22 @@ def main():
     parser.add_argument("-l", "--log_file", help="Log file path")
     parser.add_argument("-u", "--unit", choices=["seconds", "minutes", "hours"], default="seconds",
                         help="Time unit for the interval (default: seconds)")
+    parser.add_argument("--hash", choices=["md5", "blake3", "xxh3"],
+                        default="blake3" if blake3 is not None else "md5",
+                        help="Hash used to detect changed files (default: blake3 if installed, else md5)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Also print synchronization messages to the terminal")
     args = parser.parse_args()
 
     # Convert the interval to correct time unit
     args.interval = convert_interval(args.interval, args.unit)
 
+    # Select the hash used to detect changed files
+    try:
+        set_hash_algorithm(args.hash)
+    except ValueError as e:
+        parser.error(str(e))
+
     # Create a logger for the main log file
     main_logger = logging.getLogger('mainLog')
     main_logger.setLevel(logging.INFO)
@@ -198,35 +579,65 @@ def main():
     main_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
     main_logger.addHandler(main_handler)
 
+    # Mirror the main log to the terminal only when asked to
+    if args.verbose:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter('%(message)s'))
+        main_logger.addHandler(console_handler)
+
     # Create a new logger for sourceLog
     source_logger = logging.getLogger('sourceLog')
     source_logger.setLevel(logging.INFO)
-    source_handler = logging.FileHandler('sourceLog.log')
+    # Opening in write mode clears the log left over from a previous run
+    source_handler = logging.FileHandler('sourceLog.log', mode="w")
     source_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
     source_logger.addHandler(source_handler)
-    source_log_file = source_logger.handlers[0].baseFilename
 
-    event_handler = SyncEventHandler(source_logger)
-    observer = Observer()
+    # Events are handed to the main loop in memory; sourceLog.log only
+    # records them for debugging
+    event_queue = queue.SimpleQueue()
+    event_handler = SyncEventHandler(source_logger, event_queue)
+    observer = create_observer()
     observer.schedule(event_handler, path=args.source, recursive=True)
     observer.start()
 
     try:
-        # Clear the source log file at the start
-        with open('sourceLog.log', "w") as f:
-            f.truncate()
-
+        # Block on the queue between synchronizations so the loop only wakes
+        # up for new events or when the next synchronization is due
+        event_types = []
+        item_paths = []
+        deadline = time.monotonic()
         while True:
-            # Check if there are any events logged in the source log file
-            if os.path.getsize('sourceLog.log') > 0:
-                print("Synchronizing from log...")
+            try:
+                event_type, item_path = event_queue.get(timeout=max(0, deadline - time.monotonic()))
+                event_types.append(event_type)
+                item_paths.append(item_path)
+            except queue.Empty:
+                pass
+
+            # Keep collecting until the synchronization is due, even while
+            # events keep arriving
+            if time.monotonic() < deadline:
+                continue
+
+            # Check if there are any events collected since the last synchronization
+            if event_types:
+                # Clear the source log file as the batch is taken, so that it
+                # only ever holds events that are still waiting to be synchronized
+                take_event_batch(event_queue, event_types, item_paths, source_handler)
                 main_logger.info("Synchronizing from log...")
-                sync_from_log(args.source, args.replica, source_log_file, main_logger)
+                sync_from_log(args.source, args.replica, event_types, item_paths, main_logger)
+                event_types = []
+                item_paths = []
             else:
-                print("Synchronizing from source...")
                 main_logger.info("Synchronizing from source...")
                 sync_folders(args.source, args.replica, args.log_file, main_logger)
-            time.sleep(args.interval)
+
+            # After a synchronization that overran the interval, wait a full
+            # interval instead of trying to catch up on the missed ones
+            deadline += args.interval
+            if deadline <= time.monotonic():
+                deadline = time.monotonic() + args.interval
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
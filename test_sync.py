@@ -0,0 +1,200 @@
+import filecmp
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+
+from watchdog.events import FileCreatedEvent, FileModifiedEvent
+
+import sync
+
+
+class ReplayEventsTest(unittest.TestCase):
+    """Replay coalesced event batches against a synchronized replica."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.src = os.path.join(self.tmp, "source")
+        self.dest = os.path.join(self.tmp, "replica")
+        os.makedirs(self.src)
+        self.logger = logging.getLogger("test_sync")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+
+    def path(self, *parts):
+        return os.path.join(self.src, *parts)
+
+    def write(self, content, *parts):
+        with open(self.path(*parts), "w") as f:
+            f.write(content)
+
+    def replay(self, events):
+        sync.sync_from_log(self.src, self.dest, [event_type for event_type, _ in events],
+                           [self.path(*parts) for _, parts in events], self.logger)
+
+    def assertReplicaMatches(self):
+        def check(comparison):
+            self.assertEqual(comparison.left_only, [])
+            self.assertEqual(comparison.right_only, [])
+            self.assertEqual(comparison.funny_files, [])
+            for subdir in comparison.subdirs.values():
+                check(subdir)
+        check(filecmp.dircmp(self.src, self.dest))
+
+        for dirpath, _, filenames in os.walk(self.src):
+            for filename in filenames:
+                src_item_path = os.path.join(dirpath, filename)
+                dest_item_path = os.path.join(self.dest, os.path.relpath(src_item_path, self.src))
+                with open(src_item_path, "rb") as fa, open(dest_item_path, "rb") as fb:
+                    self.assertEqual(fa.read(), fb.read(), src_item_path)
+
+    def test_delete_and_recreate_file(self):
+        self.write("old", "f")
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+
+        os.remove(self.path("f"))
+        self.write("new", "f")
+        self.replay([("deleted", ("f",)), ("created", ("f",)), ("modified", ("f",))])
+        self.assertReplicaMatches()
+
+    def test_remove_directory_and_move_another_onto_it(self):
+        os.makedirs(self.path("a"))
+        os.makedirs(self.path("b"))
+        self.write("y", "a", "y")
+        self.write("x", "b", "x")
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+
+        # rm -r b; mv a b
+        shutil.rmtree(self.path("b"))
+        os.rename(self.path("a"), self.path("b"))
+        self.replay([("deleted", ("b", "x")), ("deleted", ("b",)),
+                     ("deleted", ("a",)), ("moved", ("b",))])
+        self.assertReplicaMatches()
+
+    def test_directory_replaced_by_file(self):
+        os.makedirs(self.path("d"))
+        self.write("c", "d", "c")
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+
+        shutil.rmtree(self.path("d"))
+        self.write("file", "d")
+        self.replay([("deleted", ("d", "c")), ("deleted", ("d",)),
+                     ("created", ("d",)), ("modified", ("d",))])
+        self.assertReplicaMatches()
+
+    def test_file_replaced_by_directory(self):
+        self.write("file", "f")
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+
+        os.remove(self.path("f"))
+        os.makedirs(self.path("f"))
+        self.write("c", "f", "c")
+        self.replay([("deleted", ("f",)), ("created", ("f",)), ("created", ("f", "c"))])
+        self.assertReplicaMatches()
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "requires named pipes")
+    def test_named_pipe_is_skipped(self):
+        self.write("f", "f")
+        os.mkfifo(self.path("pipe"))
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "f")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "pipe")))
+
+        self.replay([("created", ("pipe",))])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "pipe")))
+
+    def test_equal_contents_align_replica_metadata(self):
+        self.write("same", "f")
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+        dest_item_path = os.path.join(self.dest, "f")
+        os.utime(dest_item_path, ns=(1, 1))
+
+        compares = []
+        def compare(src_item_path, dest_item_path, main_logger):
+            compares.append(src_item_path)
+            return sync.files_differ(src_item_path, dest_item_path, main_logger)
+
+        for _ in range(3):
+            self.assertFalse(sync.needs_copy(self.path("f"), dest_item_path, self.logger,
+                                             compare=compare))
+        self.assertEqual(len(compares), 1)
+        self.assertEqual(os.stat(dest_item_path).st_mtime_ns, os.stat(self.path("f")).st_mtime_ns)
+
+    def test_removed_replica_entries_leave_hash_cache(self):
+        os.makedirs(self.path("d"))
+        self.write("c", "d", "c")
+        self.write("f", "f")
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+        for parts in [("d", "c"), ("f",)]:
+            sync.cached_hash(os.path.join(self.dest, *parts), self.logger)
+
+        shutil.rmtree(self.path("d"))
+        os.remove(self.path("f"))
+        sync.sync_folders(self.src, self.dest, None, self.logger)
+        self.assertFalse([p for p in sync._hash_cache if p.startswith(self.dest)])
+
+
+class CoalesceEventsTest(unittest.TestCase):
+
+    def test_created_then_deleted_is_dropped(self):
+        self.assertEqual(sync.coalesce_events(["created", "modified", "deleted"], ["p"] * 3),
+                         ([], []))
+
+    def test_repeated_modifications_collapse(self):
+        self.assertEqual(sync.coalesce_events(["created", "modified", "modified"], ["p"] * 3),
+                         (["modified"], ["p"]))
+
+    def test_deletion_before_recreate_is_kept(self):
+        self.assertEqual(sync.coalesce_events(["deleted", "created", "modified"], ["p"] * 3),
+                         (["deleted", "modified"], ["p", "p"]))
+        self.assertEqual(sync.coalesce_events(["deleted", "moved"], ["p"] * 2),
+                         (["deleted", "moved"], ["p", "p"]))
+
+
+class ParseEventLogTest(unittest.TestCase):
+
+    def test_parses_logged_events(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as f:
+            f.write("2024-01-01 00:00:00,000 - Event type: modified: /src/a: b\n")
+            f.write("2024-01-01 00:00:00,000 - unrelated message\n")
+            f.write("2024-01-01 00:00:00,000 - Event type: deleted: /src/c\n")
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(sync.parse_event_log(f.name, logging.getLogger("test_sync")),
+                         [("modified", "/src/a: b"), ("deleted", "/src/c")])
+
+
+class TakeEventBatchTest(unittest.TestCase):
+
+    def test_log_keeps_only_events_not_taken(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        handler = logging.FileHandler(os.path.join(tmp, "sourceLog.log"), mode="w")
+        self.addCleanup(handler.close)
+        source_logger = logging.getLogger("test_sync.source")
+        source_logger.addHandler(handler)
+        source_logger.propagate = False
+        self.addCleanup(source_logger.removeHandler, handler)
+        source_logger.setLevel(logging.INFO)
+
+        event_queue = queue.SimpleQueue()
+        event_handler = sync.SyncEventHandler(source_logger, event_queue)
+        event_handler.log_event(FileCreatedEvent("/src/a"))
+        event_types, item_paths = [event_queue.get()[0]], ["/src/a"]
+        event_handler.log_event(FileModifiedEvent("/src/b"))
+
+        sync.take_event_batch(event_queue, event_types, item_paths, handler)
+        self.assertEqual((event_types, item_paths), (["created", "modified"], ["/src/a", "/src/b"]))
+        self.assertEqual(sync.parse_event_log(handler.baseFilename, source_logger), [])
+
+        # Events logged while the batch is synchronized stay in the log
+        event_handler.log_event(FileModifiedEvent("/src/c"))
+        handler.flush()
+        self.assertEqual(sync.parse_event_log(handler.baseFilename, source_logger),
+                         [("modified", "/src/c")])
+
+
+if __name__ == "__main__":
+    unittest.main()